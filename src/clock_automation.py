@@ -1,188 +1,593 @@
 import os
-import time
+import re
+import csv
+import json
+import queue
 import logging
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from dotenv import load_dotenv
-import subprocess
-import tempfile
-import zipfile
-import requests
-import stat
+import functools
+import contextvars
+import threading
+from pathlib import Path
 
-# Load environment variables
-load_dotenv()
+# Selenium, urllib3, dotenv and the archive modules are imported where they
+# are used so that --help and argument errors return without loading them
 
-# Set up logging
+# Account being processed by the current --batch worker, shown in log lines
+current_account = contextvars.ContextVar("current_account", default="")
+
+class AccountFilter(logging.Filter):
+    def filter(self, record):
+        account = current_account.get()
+        record.account = f"[{account}] " if account else ""
+        return True
+
+_log_handler = logging.StreamHandler()
+_log_handler.addFilter(AccountFilter())
+
+# Set up logging (--verbose lowers the level to INFO)
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(account)s%(message)s',
     handlers=[
-        logging.StreamHandler()
+        _log_handler
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Persistent cache: downloaded drivers keyed by Chrome version, plus the
+# last browser session so later runs can attach instead of relaunching
+CACHE_DIR = Path.home() / ".cache" / "clock-automation"
+CHROMEDRIVER_CACHE_DIR = CACHE_DIR / "chromedriver"
+SESSION_FILE = CACHE_DIR / "session.json"
+
+# Serializes driver resolution so pooled threads don't write the cache at once
+CHROMEDRIVER_CACHE_LOCK = threading.Lock()
+
+# Shared HTTP pool for driver downloads, created on first use
+_http = None
+
+def http_pool():
+    global _http
+    if _http is None:
+        import urllib3
+        _http = urllib3.PoolManager(num_pools=2, maxsize=2)
+    return _http
+
+# Third-party requests the login page does not need
+BLOCKED_URLS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*hotjar.com*",
+    "*doubleclick.net*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+    "*facebook.net*",
+]
+
+# Validation-error classes the login page shows for rejected credentials
+LOGIN_ERROR_MARKUP = r'class="[^"]*\b(?:validation-summary-errors|field-validation-error)\b'
+
+def login_form_hidden_inputs(html):
+    """Return name -> value for the hidden inputs of the form holding the Password field"""
+    from html.parser import HTMLParser
+    
+    class FormParser(HTMLParser):
+        def __init__(self):
+            super().__init__()
+            self.forms = []
+        
+        def handle_starttag(self, tag, attrs):
+            attrs = dict(attrs)
+            if tag == "form" or not self.forms:
+                self.forms.append({"hidden": {}, "has_password": False})
+            if tag != "input":
+                return
+            form = self.forms[-1]
+            if attrs.get("name") == "Password":
+                form["has_password"] = True
+            if (attrs.get("type") or "").lower() == "hidden" and attrs.get("name"):
+                form["hidden"][attrs["name"]] = attrs.get("value") or ""
+    
+    parser = FormParser()
+    parser.feed(html)
+    for form in parser.forms:
+        if form["has_password"]:
+            return form["hidden"]
+    return {name: value for form in parser.forms for name, value in form["hidden"].items()}
+
+def clock_button_xpath(label, ids, onclick):
+    """XPath matching an input/button by case-insensitive label or onclick handler,
+    or any element with one of the given ids"""
+    def lower(expr):
+        return f"translate({expr},'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')"
+    
+    conditions = [
+        f"contains({lower('@value')},'{label}')",
+        f"contains({lower('normalize-space(.)')},'{label}')",
+        f"contains(@onclick,'{onclick}')",
+    ]
+    by_id = " or ".join(f"@id='{id_}'" for id_ in ids)
+    return f"//*[self::input or self::button][{' or '.join(conditions)}] | //*[{by_id}]"
+
+@functools.lru_cache(maxsize=None)
+def reuse_chrome_class():
+    """Build the ReuseChrome class on first use, once Selenium is imported"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
+    class ReuseChrome(webdriver.Remote):
+        """Remote driver bound to an already-running chromedriver session"""
+        def __init__(self, command_executor, session_id):
+            self._reuse_session_id = session_id
+            super().__init__(command_executor=command_executor, options=Options())
+        
+        def start_session(self, capabilities, *args, **kwargs):
+            # Bind to the existing session instead of creating a new one
+            self.session_id = self._reuse_session_id
+            self.caps = {}
+    
+    return ReuseChrome
+
 class ClockAutomation:
-    def __init__(self):
-        self.username = os.getenv('CLOCK_USERNAME', 'E00358@ocs')
-        self.password = os.getenv('CLOCK_PASSWORD', 'E00358@ocs')
+    # Clock button locators per operation, built once
+    _SELECTORS = {
+        "in": clock_button_xpath("clock in", ("clock-in-button", "btnClockIn"), "clockIn"),
+        "out": clock_button_xpath("clock out", ("clock-out-button", "btnClockOut"), "clockOut"),
+    }
+    
+    def __init__(self, reuse_session=False, debug=False, username=None, password=None,
+                 screenshot_prefix=""):
+        self.reuse_session = reuse_session
+        self.debug = debug
+        self.screenshot_prefix = screenshot_prefix
+        self.username = username if username is not None else os.getenv('CLOCK_USERNAME', 'E00358@ocs')
+        self.password = password if password is not None else os.getenv('CLOCK_PASSWORD', 'E00358@ocs')
         self.login_url = "https://clocklive.emplive.net/Account/LogOn"
         
     def setup_driver(self):
+        """Setup Chrome driver with third-party trackers blocked"""
+        driver = self._launch_driver()
+        if driver:
+            self._block_trackers(driver)
+        return driver
+    
+    def _block_trackers(self, driver):
+        """Block analytics/tracker requests via CDP before the first navigation"""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        except Exception as e:
+            logger.warning("Could not block tracker URLs: %s", e)
+    
+    def _launch_driver(self):
         """Setup Chrome driver for Apple Silicon Mac"""
+        import plistlib
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         try:
             chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
+            for arg in (
+                "--headless=new",
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--window-size=1920,1080",
+                # Skip first-run work and background traffic at startup
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--disable-extensions",
+                "--disable-background-networking",
+                "--disable-sync",
+                "--disable-default-apps",
+                "--disable-features=Translate,MediaRouter",
+                "--mute-audio",
+            ):
+                chrome_options.add_argument(arg)
+            
+            # Skip images, fonts and notifications; only the form controls are needed
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.fonts": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            # Return from navigation at DOMContentLoaded instead of full load
+            chrome_options.page_load_strategy = "eager"
+            
+            # Pinned driver: downloaded into the cache once, then no network needed
+            pinned = os.getenv('CHROMEDRIVER_VERSION')
+            if pinned:
+                try:
+                    chromedriver_path = self._resolve_chromedriver(pinned)
+                    service = Service(executable_path=str(chromedriver_path))
+                    driver = webdriver.Chrome(service=service, options=chrome_options)
+                    logger.info("Pinned ChromeDriver %s setup successful", pinned)
+                    return driver
+                except Exception as pin_error:
+                    logger.warning("Pinned ChromeDriver %s failed: %s", pinned, pin_error)
             
             # First try webdriver-manager
             try:
                 from webdriver_manager.chrome import ChromeDriverManager
-                service = Service(ChromeDriverManager().install())
+                with CHROMEDRIVER_CACHE_LOCK:
+                    service = Service(ChromeDriverManager().install())
                 driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("✅ Driver setup with webdriver-manager successful")
+                logger.info("Driver setup with webdriver-manager successful")
                 return driver
             except Exception as wdm_error:
-                logger.warning(f"⚠️ webdriver-manager failed: {wdm_error}")
-                logger.info("🔄 Trying manual driver setup...")
+                logger.warning("webdriver-manager failed: %s", wdm_error)
+                logger.info("Trying manual driver setup...")
             
             # Manual driver setup for Apple Silicon
             # Get Chrome version
             try:
-                chrome_version_output = subprocess.run(
-                    ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version'],
-                    capture_output=True, text=True, timeout=10
-                )
-                chrome_version = chrome_version_output.stdout.strip().split()[-1]
-                logger.info(f"🔍 Chrome version: {chrome_version}")
-            except:
+                with open('/Applications/Google Chrome.app/Contents/Info.plist', 'rb') as f:
+                    chrome_version = plistlib.load(f)['CFBundleShortVersionString']
+                logger.info("Chrome version: %s", chrome_version)
+            except FileNotFoundError:
                 chrome_version = "139.0.7258.139"  # Fallback version
-                logger.info(f"⚠️ Using fallback Chrome version: {chrome_version}")
+                logger.info("Using fallback Chrome version: %s", chrome_version)
             
-            # Download the correct ARM driver
-            driver_url = f"https://storage.googleapis.com/chrome-for-testing-public/{chrome_version}/mac-arm64/chromedriver-mac-arm64.zip"
-            
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                zip_path = os.path.join(tmp_dir, "chromedriver.zip")
-                
-                # Download driver
-                logger.info(f"📥 Downloading ChromeDriver from: {driver_url}")
-                response = requests.get(driver_url, timeout=30)
-                with open(zip_path, 'wb') as f:
-                    f.write(response.content)
-                
-                # Extract
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(tmp_dir)
-                
-                # Find chromedriver executable
-                chromedriver_path = None
-                for root, dirs, files in os.walk(tmp_dir):
-                    if 'chromedriver' in files:
-                        chromedriver_path = os.path.join(root, 'chromedriver')
-                        break
-                    for file in files:
-                        if file.startswith('chromedriver'):
-                            chromedriver_path = os.path.join(root, file)
-                            break
-                
-                if chromedriver_path and os.path.exists(chromedriver_path):
-                    # Make executable
-                    os.chmod(chromedriver_path, stat.S_IRWXU)
-                    
-                    # Use the downloaded driver
-                    service = Service(executable_path=chromedriver_path)
-                    driver = webdriver.Chrome(service=service, options=chrome_options)
-                    logger.info("✅ Manual driver setup successful")
-                    return driver
-                else:
-                    raise Exception("Could not find chromedriver in downloaded package")
+            # Use the cached ARM driver, downloading it on first use
+            chromedriver_path = self._resolve_chromedriver(chrome_version)
+            service = Service(executable_path=str(chromedriver_path))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            logger.info("Manual driver setup successful")
+            return driver
             
         except Exception as e:
-            logger.error(f"❌ All driver setup methods failed: {e}")
+            logger.error("All driver setup methods failed: %s", e)
             
             # Final fallback: try system chromedriver if available
             try:
-                logger.info("🔄 Trying system chromedriver...")
+                logger.info("Trying system chromedriver...")
                 service = Service(executable_path='/usr/local/bin/chromedriver')
                 driver = webdriver.Chrome(service=service, options=chrome_options)
-                logger.info("✅ System chromedriver worked!")
+                logger.info("System chromedriver worked!")
                 return driver
             except:
-                logger.error("❌ System chromedriver also failed")
+                logger.error("System chromedriver also failed")
                 return None
     
+    def get_driver(self):
+        """Attach to the saved browser session if enabled, else launch a new one"""
+        if self.reuse_session:
+            driver = self._attach_session()
+            if driver:
+                return driver
+        
+        driver = self.setup_driver()
+        if driver and self.reuse_session:
+            self._save_session(driver)
+        return driver
+    
+    def _attach_session(self):
+        """Attach to the session recorded in SESSION_FILE, or return None"""
+        try:
+            with open(SESSION_FILE) as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        try:
+            driver = reuse_chrome_class()(session["executor_url"], session["session_id"])
+            # Cheap round trip to confirm the session is still alive
+            driver.current_url
+            logger.info("Reusing browser session: %s", session['session_id'])
+            return driver
+        except Exception as e:
+            logger.info("Saved session unavailable, launching a new browser: %s", e)
+            self._shutdown_saved_executor(session.get("executor_url"))
+            return None
+    
+    def _shutdown_saved_executor(self, executor_url):
+        """Stop the detached chromedriver from a dead session so they don't pile up"""
+        try:
+            SESSION_FILE.unlink(missing_ok=True)
+            if executor_url:
+                # chromedriver exits (closing its browsers) on GET /shutdown
+                http_pool().request('GET', f"{executor_url.rstrip('/')}/shutdown", timeout=2, retries=False)
+                logger.info("Stopped stale chromedriver at %s", executor_url)
+        except Exception as e:
+            logger.info("Stale chromedriver already gone: %s", e)
+    
+    def _save_session(self, driver):
+        """Record the session and keep chromedriver alive after this process exits"""
+        try:
+            SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(SESSION_FILE, 'w') as f:
+                json.dump({
+                    "executor_url": driver.command_executor._url,
+                    "session_id": driver.session_id,
+                }, f)
+            # Stop Service.__del__ from terminating chromedriver on exit
+            driver.service.process = None
+            logger.info("Browser session saved: %s", SESSION_FILE)
+        except Exception as e:
+            logger.warning("Could not save browser session: %s", e)
+    
+    def _cached_chromedriver(self, version):
+        """Return the cached chromedriver for version if it is usable, else None"""
+        import subprocess
+        
+        cache_path = CHROMEDRIVER_CACHE_DIR / version / "chromedriver"
+        if not (cache_path.exists() and os.access(cache_path, os.X_OK)):
+            return None
+        
+        # Catch truncated or corrupt binaries before handing them to Selenium
+        try:
+            out = subprocess.run(
+                [str(cache_path), "--version"], capture_output=True, text=True, timeout=1
+            )
+            if out.returncode == 0 and "ChromeDriver" in out.stdout:
+                return cache_path
+        except Exception:
+            pass
+        
+        logger.warning("Cached ChromeDriver at %s is unusable, discarding it", cache_path)
+        cache_path.unlink(missing_ok=True)
+        return None
+    
+    def _resolve_chromedriver(self, chrome_version):
+        """Return a cached chromedriver for chrome_version, downloading it if missing"""
+        with CHROMEDRIVER_CACHE_LOCK:
+            cached = self._cached_chromedriver(chrome_version)
+            if cached:
+                logger.info("Using cached ChromeDriver: %s", cached)
+                return cached
+            return self._download_chromedriver(chrome_version)
+    
+    def _download_chromedriver(self, chrome_version, revalidate=True):
+        """Download and extract chromedriver into the cache; caller holds CHROMEDRIVER_CACHE_LOCK"""
+        import shutil
+        import tempfile
+        import zipfile
+        
+        cache_path = CHROMEDRIVER_CACHE_DIR / chrome_version / "chromedriver"
+        cache_dir = cache_path.parent
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        zip_path = cache_dir / "chromedriver.zip"
+        meta_path = cache_dir / "meta.json"
+        
+        # Download the correct ARM driver
+        driver_url = f"https://storage.googleapis.com/chrome-for-testing-public/{chrome_version}/mac-arm64/chromedriver-mac-arm64.zip"
+        
+        # Revalidate a previously downloaded zip instead of fetching it again
+        headers = {}
+        if revalidate and zip_path.exists():
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+            except (OSError, ValueError):
+                pass
+        
+        logger.info("Downloading ChromeDriver from: %s", driver_url)
+        response = http_pool().request(
+            'GET', driver_url, headers=headers, preload_content=False, timeout=30
+        )
+        try:
+            if response.status == 304:
+                logger.info("Downloaded ChromeDriver zip is up to date")
+            elif response.status == 200:
+                # Write to a temp file and rename so a partial download never
+                # replaces a good zip
+                part_path = zip_path.with_name(zip_path.name + ".part")
+                with open(part_path, 'wb') as f:
+                    shutil.copyfileobj(response, f, length=65536)
+                os.replace(part_path, zip_path)
+                with open(meta_path, 'w') as f:
+                    json.dump({
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }, f)
+            else:
+                raise Exception(f"ChromeDriver download failed with HTTP {response.status}")
+        finally:
+            response.release_conn()
+        
+        # Extract only the chromedriver binary
+        try:
+            with tempfile.TemporaryDirectory(dir=cache_dir) as tmp_dir:
+                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                    name = next(
+                        (n for n in zip_ref.namelist() if n == 'chromedriver' or n.endswith('/chromedriver')),
+                        None
+                    )
+                    if not name:
+                        raise zipfile.BadZipFile("Could not find chromedriver in downloaded package")
+                    chromedriver_path = zip_ref.extract(name, tmp_dir)
+                
+                shutil.move(chromedriver_path, cache_path)
+        except zipfile.BadZipFile as e:
+            # Drop the bad zip and its validators so the next request is unconditional
+            zip_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            if not revalidate:
+                raise
+            logger.warning("Cached ChromeDriver zip is unusable (%s), downloading again", e)
+            return self._download_chromedriver(chrome_version, revalidate=False)
+        
+        # Make executable
+        os.chmod(cache_path, 0o755)
+        logger.info("ChromeDriver cached at: %s", cache_path)
+        return cache_path
+    
+    def _screenshot(self, driver, name):
+        """Save name.png, prefixed with screenshot_prefix so batch rows don't collide"""
+        filename = f"{self.screenshot_prefix}{name}.png"
+        driver.save_screenshot(filename)
+        logger.info("Screenshot saved: %s", filename)
+    
+    def _set(self, driver, element, value):
+        """Set a field's value in one script call instead of per-key send_keys"""
+        driver.execute_script(
+            "arguments[0].value = arguments[1];"
+            "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));"
+            "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));",
+            element, value
+        )
+    
     def login(self, driver):
-        """Login to the system"""
+        """Login to the system, preferring a plain HTTP login over the browser form
+        
+        The browser form is only tried when the HTTP login could not be
+        completed; credentials the server rejected are not submitted twice.
+        """
+        result = self._login_http(driver)
+        if result is None:
+            logger.info("Falling back to browser login...")
+            return self._login_browser(driver)
+        return result
+    
+    def _login_http(self, driver):
+        """POST the login form with requests and hand the session cookies to the driver
+        
+        Returns True on success, False if the credentials were rejected and
+        None if the HTTP login could not be completed.
+        """
+        import requests
+        
         try:
-            logger.info("🌐 Navigating to login page...")
-            driver.get(self.login_url)
-            time.sleep(3)
+            logger.info("Logging in over HTTP...")
+            with requests.Session() as sess:
+                resp = sess.get(self.login_url, timeout=15)
+                resp.raise_for_status()
+                # Send every hidden field of the form, as the browser would
+                data = login_form_hidden_inputs(resp.text)
+                if "__RequestVerificationToken" not in data:
+                    logger.warning("HTTP login unavailable - no anti-forgery token on login page")
+                    return None
+                data.update({"Username": self.username, "Password": self.password})
+                
+                resp = sess.post(self.login_url, data=data, timeout=15)
+                resp.raise_for_status()
+                if "login" in resp.url.lower() or "logon" in resp.url.lower():
+                    # Only the server's validation errors mean the credentials were
+                    # rejected; anything else may be a form we didn't reproduce fully
+                    if re.search(LOGIN_ERROR_MARKUP, resp.text):
+                        logger.error("Login failed - credentials rejected")
+                        return False
+                    logger.warning("HTTP login returned to the login page without a validation error")
+                    return None
+                
+                # The driver must be on the site's domain before cookies can be added
+                driver.get(self.login_url)
+                for c in sess.cookies:
+                    driver.add_cookie({
+                        "name": c.name,
+                        "value": c.value,
+                        "domain": c.domain,
+                        "path": c.path,
+                        "secure": bool(c.secure),
+                    })
+                driver.get(resp.url)
             
-            # Take screenshot for debugging
-            driver.save_screenshot("login_page.png")
-            logger.info("📸 Screenshot saved: login_page.png")
+            if "login" in driver.current_url.lower() or "logon" in driver.current_url.lower():
+                logger.warning("Browser not authenticated by HTTP login cookies")
+                return None
             
-            # Enter credentials
-            logger.info("🔐 Entering credentials...")
+            if self.debug:
+                self._screenshot(driver, "after_login")
+            
+            logger.info("Login successful!")
+            return True
+        
+        except Exception as e:
+            logger.warning("HTTP login failed: %s", e)
+            return None
+    
+    def _login_browser(self, driver):
+        """Login through the browser form"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
+        try:
+            logger.info("Navigating to login page...")
+            driver.get(self.login_url)
             username_field = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.ID, "Username"))
             )
+            
+            # Take screenshot for debugging
+            if self.debug:
+                self._screenshot(driver, "login_page")
+            
+            # Enter credentials
+            logger.info("Entering credentials...")
             password_field = driver.find_element(By.ID, "Password")
             login_btn = driver.find_element(By.CSS_SELECTOR, "[type='submit']")
             
-            username_field.clear()
-            username_field.send_keys(self.username)
-            logger.info("✅ Username entered")
+            self._set(driver, username_field, self.username)
+            logger.info("Username entered")
             
-            password_field.clear()
-            password_field.send_keys(self.password)
-            logger.info("✅ Password entered")
+            self._set(driver, password_field, self.password)
+            logger.info("Password entered")
             
+            before_url = driver.current_url
             login_btn.click()
-            logger.info("✅ Login button clicked")
+            logger.info("Login button clicked")
             
-            # Wait for login to complete
-            time.sleep(3)
+            # Return on the first success or failure signal: redirect, clock
+            # button rendered, or a validation error shown on the login form
+            try:
+                WebDriverWait(driver, 10).until(EC.any_of(
+                    EC.url_changes(before_url),
+                    EC.presence_of_element_located(
+                        (By.XPATH, self._SELECTORS["in"] + " | " + self._SELECTORS["out"])
+                    ),
+                    EC.visibility_of_element_located(
+                        (By.CSS_SELECTOR, ".validation-summary-errors, .field-validation-error, .alert-danger")
+                    )
+                ))
+            except TimeoutException:
+                pass
             
             # Take screenshot after login
-            driver.save_screenshot("after_login.png")
-            logger.info("📸 Screenshot saved: after_login.png")
+            if self.debug:
+                self._screenshot(driver, "after_login")
             
             # Check login success
             current_url = driver.current_url
             if "login" in current_url.lower() or "logon" in current_url.lower():
-                logger.error("❌ Login failed - still on login page")
+                logger.error("Login failed - still on login page")
                 return False
                 
-            logger.info("🎉 Login successful!")
+            logger.info("Login successful!")
             return True
             
         except Exception as e:
-            logger.error(f"Login failed: {e}")
+            logger.error("Login failed: %s", e)
             # Take screenshot on error
             try:
-                driver.save_screenshot("login_error.png")
-                logger.info("📸 Screenshot saved: login_error.png")
+                self._screenshot(driver, "login_error")
             except:
                 pass
             return False
     
-    def perform_clock_operation(self, operation_type):
-        """Perform clock in/out operation"""
-        logger.info(f"🚀 Starting {operation_type.upper()} operation")
+    def perform_clock_operation(self, operation_type, driver=None):
+        """Perform clock in/out operation
         
-        driver = self.setup_driver()
+        An injected driver is left open for the caller to reuse.
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
+        logger.info("Starting %s operation", operation_type.upper())
+        
+        owns_driver = driver is None
+        if owns_driver:
+            driver = self.get_driver()
         if not driver:
-            logger.error("❌ Failed to setup Chrome driver")
+            logger.error("Failed to setup Chrome driver")
             return False
             
         try:
@@ -190,107 +595,213 @@ class ClockAutomation:
                 return False
             
             # Find and click clock button
-            logger.info(f"⏰ Looking for {operation_type} button...")
+            logger.info("Looking for %s button...", operation_type)
             
-            if operation_type.lower() == "in":
-                selectors = [
-                    "input[value*='Clock In']",
-                    "input[value*='clock in']",
-                    "#clock-in-button",
-                    "#btnClockIn",
-                    "button[value*='Clock In']",
-                    "button[onclick*='clockIn']"
-                ]
-            else:
-                selectors = [
-                    "input[value*='Clock Out']", 
-                    "input[value*='clock out']",
-                    "#clock-out-button",
-                    "#btnClockOut",
-                    "button[value*='Clock Out']",
-                    "button[onclick*='clockOut']"
-                ]
-            
-            # Try each selector
-            button_found = False
-            for selector in selectors:
-                try:
-                    clock_btn = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    if clock_btn.is_displayed():
-                        logger.info(f"✅ Found {operation_type} button using: {selector}")
-                        clock_btn.click()
-                        logger.info(f"✅ {operation_type.capitalize()} button clicked")
-                        button_found = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-            
-            if not button_found:
-                logger.error(f"❌ Could not find {operation_type} button")
+            # Case-insensitive match on value/text, ids or onclick in a single lookup
+            xpath = self._SELECTORS[operation_type.lower()]
+            try:
+                clock_btn = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.XPATH, xpath))
+                )
+            except TimeoutException:
+                logger.error("Could not find %s button", operation_type)
                 # Take screenshot to see what's on the page
-                driver.save_screenshot("button_not_found.png")
-                logger.info("📸 Screenshot saved: button_not_found.png")
+                self._screenshot(driver, "button_not_found")
                 return False
             
-            # Wait for operation to complete
-            time.sleep(3)
+            if logger.isEnabledFor(logging.INFO):
+                # get_attribute is a browser round trip; skip it when not logged
+                logger.info("Found %s button: %s", operation_type, clock_btn.get_attribute('outerHTML')[:80])
+            before_url = driver.current_url
+            clock_btn.click()
+            logger.info("%s button clicked", operation_type.capitalize())
+            
+            # Wait for a transition caused by the click: the page reloading,
+            # navigating away, or showing a success banner
+            try:
+                WebDriverWait(driver, 5).until(EC.any_of(
+                    EC.staleness_of(clock_btn),
+                    EC.url_changes(before_url),
+                    EC.visibility_of_element_located((By.CSS_SELECTOR, ".alert-success"))
+                ))
+            except TimeoutException:
+                logger.warning("No confirmation seen after %s click", operation_type)
             
             # Take final screenshot
-            driver.save_screenshot("after_operation.png")
-            logger.info("📸 Screenshot saved: after_operation.png")
+            if self.debug:
+                self._screenshot(driver, "after_operation")
             
-            logger.info(f"🎉 {operation_type.upper()} completed successfully!")
+            logger.info("%s completed successfully!", operation_type.upper())
             return True
             
         except Exception as e:
-            logger.error(f"💥 Operation failed: {e}")
+            logger.error("Operation failed: %s", e)
             # Take screenshot on error
             try:
-                driver.save_screenshot("operation_error.png")
-                logger.info("📸 Screenshot saved: operation_error.png")
+                self._screenshot(driver, "operation_error")
             except:
                 pass
             return False
         finally:
+            if owns_driver and self.reuse_session:
+                logger.info("Leaving browser running for the next run")
+            elif owns_driver:
+                try:
+                    driver.quit()
+                    logger.info("Browser closed")
+                except:
+                    pass
+
+class ClockAutomationPool:
+    """Run clock operations for several accounts over a shared pool of drivers"""
+    def __init__(self, size=4, debug=False):
+        self.size = size
+        self.debug = debug
+        self._drivers = queue.Queue()
+        self._all_drivers = []
+    
+    def _acquire(self):
+        """Take an idle driver, launching a new one if none is free"""
+        try:
+            return self._drivers.get_nowait()
+        except queue.Empty:
+            driver = ClockAutomation(debug=self.debug).setup_driver()
+            if driver:
+                self._all_drivers.append(driver)
+            return driver
+    
+    def _release(self, driver):
+        """Clear the account's cookies and return the driver to the pool"""
+        try:
+            driver.delete_all_cookies()
+            self._drivers.put(driver)
+        except Exception as e:
+            logger.warning("Dropping driver from pool: %s", e)
+    
+    def _run(self, index, row):
+        username, password, operation_type = row
+        # Tag this row's log lines and screenshots with its row number and account
+        token = current_account.set(f"#{index + 1} {username}")
+        safe_username = re.sub(r'[^\w.-]', '_', username)
+        automation = ClockAutomation(
+            debug=self.debug, username=username, password=password,
+            screenshot_prefix=f"{index + 1}_{safe_username}_"
+        )
+        try:
+            driver = self._acquire()
+            if not driver:
+                logger.error("Failed to setup Chrome driver")
+                return False
+            try:
+                return automation.perform_clock_operation(operation_type, driver=driver)
+            finally:
+                self._release(driver)
+        finally:
+            current_account.reset(token)
+    
+    def run(self, rows):
+        """Run (username, password, operation) rows concurrently; returns results in order"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(self._run, range(len(rows)), rows))
+    
+    def close(self):
+        for driver in self._all_drivers:
             try:
                 driver.quit()
-                logger.info("✅ Browser closed")
             except:
                 pass
+        self._all_drivers = []
+
+def read_batch(path):
+    """Read username,password,operation rows from a CSV file"""
+    rows = []
+    with open(path, newline='') as f:
+        for line_no, row in enumerate(csv.reader(f), 1):
+            if not row:
+                continue
+            row = tuple(field.strip() for field in row)
+            if len(row) != 3 or not all(row) or row[2].lower() not in ('in', 'out'):
+                raise ValueError(f"{path}:{line_no}: expected username,password,in|out (no header row)")
+            rows.append(row)
+    return rows
 
 def main():
     """Command line interface"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Clock Automation')
-    parser.add_argument('operation', choices=['in', 'out'], help='Clock in or out')
+    parser.add_argument('operation', nargs='?', choices=['in', 'out'], help='Clock in or out')
     parser.add_argument('--env', '-e', default='.env', help='Environment file path')
     parser.add_argument('--dry-run', action='store_true', help='Test without actually clicking')
+    parser.add_argument('--reuse', action=argparse.BooleanOptionalAction, default=False,
+                        help='Attach to the browser left running by a previous run')
+    parser.add_argument('--debug', action='store_true', help='Save screenshots at each step')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log progress of each step')
+    parser.add_argument('--batch', metavar='CSV', help='Run username,password,operation rows from a CSV file')
+    parser.add_argument('--pool-size', type=int, default=4, help='Concurrent browsers for --batch')
     
     args = parser.parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.INFO)
+    if not args.operation and not args.batch:
+        parser.error('operation is required unless --batch is given')
+    if args.pool_size < 1:
+        parser.error('--pool-size must be at least 1')
+    if args.batch and args.dry_run:
+        parser.error('--dry-run cannot be combined with --batch')
+    if args.batch and args.operation:
+        parser.error('operation cannot be combined with --batch; each CSV row names its own')
+    if args.batch and args.reuse:
+        parser.error('--reuse cannot be combined with --batch')
+    if args.batch:
+        try:
+            rows = read_batch(args.batch)
+        except (OSError, ValueError) as e:
+            parser.error(f'--batch: {e}')
     
-    # Load environment variables from specified file
+    # Load environment variables, then the specified file
+    from dotenv import load_dotenv
+    load_dotenv()
     if os.path.exists(args.env):
         load_dotenv(args.env)
     
     if args.dry_run:
-        logger.info("🧪 DRY RUN MODE - No actual operations will be performed")
+        logger.info("DRY RUN MODE - No actual operations will be performed")
     
-    automation = ClockAutomation()
+    if args.batch:
+        pool = ClockAutomationPool(size=args.pool_size, debug=args.debug)
+        try:
+            results = pool.run(rows)
+        finally:
+            pool.close()
+        
+        failed = [row[0] for row, ok in zip(rows, results) if not ok]
+        if failed:
+            print(f"❌ {len(failed)}/{len(rows)} operations failed: {', '.join(failed)}")
+            return 1
+        print(f"✅ {len(rows)} operations completed successfully!")
+        return 0
+    
+    automation = ClockAutomation(reuse_session=args.reuse, debug=args.debug)
     
     if args.dry_run:
         # Just test driver setup and login
         driver = automation.setup_driver()
+        success = False
         if driver:
-            logger.info("✅ Driver setup successful in dry-run mode")
+            logger.info("Driver setup successful in dry-run mode")
             success = automation.login(driver)
             if success:
-                logger.info("✅ Login successful in dry-run mode")
+                logger.info("Login successful in dry-run mode")
             driver.quit()
-        return 0
+        
+        if success:
+            print("✅ Dry run completed successfully!")
+            return 0
+        print("❌ Dry run failed!")
+        return 1
     
     success = automation.perform_clock_operation(args.operation)
     